@@ -0,0 +1,40 @@
+"""One-off conversion of the G-NAF parquet to GeoArrow-encoded GeoParquet.
+
+The original `data/gnaf_prop.parquet` stores geometry as a hex-WKB string
+column, which forces a WKB decode on every read. Re-encoding as GeoParquet
+with `geometry_encoding='geoarrow'` stores coordinates as contiguous arrays
+so `geopandas.read_parquet` builds points without any WKB parsing.
+
+Usage:
+    PYTHONPATH=. python scripts/convert_gnaf_to_geoparquet.py
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# ensure repo root on path
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT))
+
+from scripts.per_locality_scores import points_from_parquet
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument('--input', default='data/gnaf_prop.parquet')
+    p.add_argument('--output', default=None, help='Defaults to rewriting the input in place')
+    args = p.parse_args()
+
+    in_fp = Path(args.input)
+    out_fp = Path(args.output) if args.output else in_fp
+
+    gdf = points_from_parquet(in_fp)
+    # drop the redundant hex-WKB column; geometry is now the active column
+    if 'geom' in gdf.columns and gdf.geometry.name != 'geom':
+        gdf = gdf.drop(columns=['geom'])
+    gdf.to_parquet(out_fp, geometry_encoding='geoarrow')
+    print('Wrote', out_fp, f'({len(gdf)} rows, geoarrow encoding)')
+
+
+if __name__ == '__main__':
+    main()
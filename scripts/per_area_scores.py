@@ -6,10 +6,34 @@ Usage:
     PYTHONPATH=. python scripts/per_area_scores.py --field sa4
 """
 import argparse
+import csv
+import heapq
 import sys
 from pathlib import Path
 import geopandas as gpd
+import numpy as np
 import pandas as pd
+import pyproj
+import shapely
+
+try:
+    from dask import compute, delayed
+    _HAS_DASK = True
+except ImportError:  # dask is an optional accelerator; fall back to serial
+    _HAS_DASK = False
+
+try:
+    import dask_geopandas
+    _HAS_DASK_GEO = True
+except ImportError:
+    _HAS_DASK_GEO = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    _HAS_PYARROW = True
+except ImportError:  # fall back to the stdlib csv writer
+    _HAS_PYARROW = False
 
 # Ensure the repository root is on sys.path so this script can be run directly
 # (without requiring PYTHONPATH to be set externally).
@@ -25,11 +49,37 @@ def ensure_projected(gdf):
     if gdf.crs is None:
         return gdf
     if getattr(gdf.crs, 'is_geographic', False):
-        return gdf.to_crs(epsg=3857)
+        # reproject all coordinates in one pyproj Transformer call over the
+        # flat coordinate array rather than geometry-by-geometry via to_crs
+        transformer = pyproj.Transformer.from_crs(gdf.crs, 'EPSG:3857', always_xy=True)
+        geoms = gdf.geometry.values.copy()
+        coords = shapely.get_coordinates(geoms)
+        x2, y2 = transformer.transform(coords[:, 0], coords[:, 1])
+        new_geoms = shapely.set_coordinates(geoms, np.column_stack([x2, y2]))
+        gdf = gdf.copy()
+        gdf.geometry = gpd.GeoSeries(new_geoms, index=gdf.index, crs='EPSG:3857')
     return gdf
 
 
-def compute_per_area(roads_fp, cad_fp, field='sa4'):
+def _score_one_area(name, area_geom, cad_cand, roads_cand, field):
+    try:
+        # clip only the candidate subsets, via the vectorized intersection ufunc
+        cad_clip = cad_cand.copy()
+        cad_clip.geometry = shapely.intersection(cad_clip.geometry.values, area_geom)
+        roads_clip = roads_cand.copy()
+        roads_clip.geometry = shapely.intersection(roads_clip.geometry.values, area_geom)
+        score = compute_walkability_score(roads_clip, cad_clip, area_geom=area_geom)
+        return {
+            field: name,
+            'score': score,
+            'n_parcels': len(cad_clip),
+            'road_km_per_km2': compute_road_length_density(roads_clip) if len(roads_clip)>0 else 0.0,
+        }
+    except Exception as e:
+        return {field: name, 'score': None, 'error': str(e)}
+
+
+def iter_per_area_rows(roads_fp, cad_fp, field='sa4'):
     cad = load_gpkg(str(cad_fp))
     roads = load_gpkg(str(roads_fp))
 
@@ -40,26 +90,57 @@ def compute_per_area(roads_fp, cad_fp, field='sa4'):
     if field not in cad.columns:
         raise ValueError(f'Field "{field}" not found in cadastre columns: {list(cad.columns)}')
 
-    results = []
-    groups = cad.groupby(field)
-    for name, grp in groups:
-        try:
-            area_geom = grp.unary_union
-            # clip datasets
-            cad_clip = gpd.clip(cad, gpd.GeoSeries([area_geom], crs=cad.crs))
-            roads_clip = gpd.clip(roads, gpd.GeoSeries([area_geom], crs=roads.crs))
-            score = compute_walkability_score(roads_clip, cad_clip, area_geom=area_geom)
-            results.append({
-                field: name,
-                'score': score,
-                'n_parcels': len(cad_clip),
-                'road_km_per_km2': compute_road_length_density(roads_clip) if len(roads_clip)>0 else 0.0,
-            })
-        except Exception as e:
-            results.append({field: name, 'score': None, 'error': str(e)})
-
-    df = pd.DataFrame(results)
-    return df
+    # dissolve once to get one geometry per area, then resolve all candidate
+    # (area, feature) pairs in one spatial join per dataset instead of
+    # rebuilding an R-tree inside gpd.clip for every group
+    area_series = cad.dissolve(by=field).geometry
+    area_geoms = area_series.values
+    n_areas = len(area_series)
+
+    if _HAS_DASK_GEO:
+        # dask_geopandas partitions the join, so candidate resolution for
+        # all areas runs as one parallel sjoin + groupby plan
+        areas = dask_geopandas.from_geopandas(
+            gpd.GeoDataFrame(geometry=area_geoms, crs=cad.crs), npartitions=1)
+
+        def _per_area_subsets(gdf):
+            left = dask_geopandas.from_geopandas(
+                gdf[[gdf.geometry.name]].reset_index(drop=True), npartitions=4)
+            joined = dask_geopandas.sjoin(left, areas, predicate='intersects').compute()
+            groups = joined.groupby('index_right').groups
+            return [np.sort(np.asarray(groups.get(k, []), dtype=np.int64))
+                    for k in range(n_areas)]
+
+        cad_subsets = _per_area_subsets(cad)
+        roads_subsets = _per_area_subsets(roads)
+    else:
+        cad_area_ix, cad_feat_ix = cad.sindex.query(area_geoms, predicate='intersects')
+        roads_area_ix, roads_feat_ix = roads.sindex.query(area_geoms, predicate='intersects')
+
+        def _per_area_subsets(area_ix, feat_ix):
+            order = np.lexsort((feat_ix, area_ix))
+            area_ix, feat_ix = area_ix[order], feat_ix[order]
+            bounds = np.searchsorted(area_ix, np.arange(n_areas + 1))
+            return [feat_ix[bounds[k]:bounds[k + 1]] for k in range(n_areas)]
+
+        cad_subsets = _per_area_subsets(cad_area_ix, cad_feat_ix)
+        roads_subsets = _per_area_subsets(roads_area_ix, roads_feat_ix)
+
+    # each area is independent; ship only its candidate subsets per task
+    args = [
+        (name, area_geom, cad.iloc[cad_subsets[k]], roads.iloc[roads_subsets[k]], field)
+        for k, (name, area_geom) in enumerate(area_series.items())
+    ]
+    if _HAS_DASK and len(args) > 1:
+        tasks = [delayed(_score_one_area)(*a) for a in args]
+        yield from compute(*tasks, scheduler='processes')
+    else:
+        for a in args:
+            yield _score_one_area(*a)
+
+
+def compute_per_area(roads_fp, cad_fp, field='sa4'):
+    return pd.DataFrame(iter_per_area_rows(roads_fp, cad_fp, field=field))
 
 
 def main():
@@ -75,14 +156,50 @@ def main():
     out_dir = root / 'outputs'
     out_dir.mkdir(exist_ok=True)
 
-    df = compute_per_area(roads_fp, cad_fp, field=args.field)
     out_fp = out_dir / f'per_area_scores_{args.field}.csv'
-    df.to_csv(out_fp, index=False)
+    fieldnames = [args.field, 'score', 'n_parcels', 'road_km_per_km2', 'error']
+    rows = iter_per_area_rows(roads_fp, cad_fp, field=args.field)
+    top = []
+
+    def _track(row, i):
+        if row.get('score') is not None:
+            # keep only the running top 10 for the end-of-run summary
+            heapq.heappush(top, (row['score'], i, row))
+            if len(top) > 10:
+                heapq.heappop(top)
+
+    if _HAS_PYARROW:
+        # Arrow formats rows in C; stream in record-batch chunks
+        schema = pa.schema([
+            (args.field, pa.string()), ('score', pa.float64()),
+            ('n_parcels', pa.int64()), ('road_km_per_km2', pa.float64()),
+            ('error', pa.string()),
+        ])
+        opts = pacsv.WriteOptions(quoting_style='needed')
+        with pacsv.CSVWriter(str(out_fp), schema, write_options=opts) as writer:
+            chunk = []
+            for i, row in enumerate(rows):
+                chunk.append(row)
+                _track(row, i)
+                if len(chunk) >= 1024:
+                    writer.write_table(pa.Table.from_pylist(chunk, schema=schema))
+                    chunk = []
+            if chunk:
+                writer.write_table(pa.Table.from_pylist(chunk, schema=schema))
+    else:
+        with open(out_fp, 'w', newline='') as f:
+            # stream rows as they are produced instead of materializing them all
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            for i, row in enumerate(rows):
+                writer.writerow(row)
+                _track(row, i)
     print('Wrote', out_fp)
 
     # print top areas
     print('\nTop 10 by score:')
-    print(df.dropna(subset=['score']).sort_values('score', ascending=False).head(10).to_string(index=False))
+    top_rows = [row for _, _, row in sorted(top, reverse=True)]
+    print(pd.DataFrame(top_rows).to_string(index=False))
 
 
 if __name__ == '__main__':
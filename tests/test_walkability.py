@@ -1,8 +1,18 @@
+import numpy as np
 import pytest
 from shapely.geometry import LineString, Polygon
 import geopandas as gpd
 
-from src.walkability import compute_road_length_density, compute_intersection_density, compute_parcel_density, compute_walkability_score
+from src.walkability import (
+    compute_road_length_density,
+    compute_intersection_density,
+    compute_parcel_density,
+    compute_walkability_score,
+    compute_walkability_score_batch,
+    _count_unique_points,
+    _line_coordinates,
+    _total_length_m,
+)
 
 
 def make_roads():
@@ -50,3 +60,39 @@ def test_more_intersections_increase_score():
     roads2 = gpd.pd.concat([roads, roads2], ignore_index=True)
     s2 = compute_walkability_score(roads2, parcels)
     assert s2 >= base_score
+
+
+def test_batch_score_matches_scalar():
+    roads = make_roads()
+    parcels = make_parcels()
+
+    rd = compute_road_length_density(roads)
+    idens = compute_intersection_density(roads)
+    pdens = compute_parcel_density(parcels)
+
+    scalar = compute_walkability_score(roads, parcels)
+    batch = compute_walkability_score_batch([rd], [idens], [pdens])
+    assert batch.shape == (1,)
+    assert batch[0] == pytest.approx(scalar)
+
+    # saturated metrics must clip to 100, zeros to 0
+    extremes = compute_walkability_score_batch([1e6, 0.0], [1e6, 0.0], [1e6, 0.0])
+    assert list(extremes) == [100.0, 0.0]
+
+
+def test_count_unique_points_dedupes_coincident():
+    coords = np.array([
+        [0.0, 0.0],
+        [0.0, 0.0],
+        [500.0, 500.0],
+        [500.0 + 1e-9, 500.0],  # within the snap tolerance of the previous
+        [1000.0, 0.0],
+    ])
+    assert _count_unique_points(coords) == 3
+
+
+def test_total_length_m_matches_geos_length():
+    roads = make_roads()
+    geoms = roads.geometry.values
+    total = _total_length_m(geoms, *_line_coordinates(geoms))
+    assert total == pytest.approx(roads.geometry.length.sum())